@@ -22,10 +22,12 @@ def main() -> int:
         if not formula.clauses:
             return 0
         else:
-            print("The formula is satisfiable (SAT).\n\nVariable Assignment:")
-            for var in sorted(model):
-                print(f"  {var} = {model[var]}")
-            print("\nIf variables that you typed in are not in the variable assignment, then the satisfiability of the formula is independent from their truth values.")
+            # one buffered write for the whole model instead of a print (and
+            # with it a flush) per variable
+            lines = ["The formula is satisfiable (SAT).\n\nVariable Assignment:"]
+            lines.extend(f"  {var} = {val}" for var, val in sorted(model.items()))
+            lines.append("\nIf variables that you typed in are not in the variable assignment, then the satisfiability of the formula is independent from their truth values.\n")
+            sys.stdout.write("\n".join(lines))
         return 0
 
 
@@ -1,42 +1,102 @@
-from dataclasses import dataclass
-from typing import Dict, FrozenSet, Iterable, Optional, Set
+from array import array
+from typing import Iterable, List, Optional
 
-from .literals import Literal
+from .literals import lit_to_str
+
+
+
+# assignment codes stored in the assignment bytearray, one slot per variable id
+UNASSIGNED = 0
+TRUE = 1
+FALSE = 2
+
+
+
+def make_specialized_evaluate(width: int):
+    """
+    This function generates an evaluate function with the literal loop fully
+    unrolled for one fixed clause width. Most CNF inputs are short-clause
+    (2- and 3-SAT), so the unrolled versions skip the loop bookkeeping that
+    the generic evaluate pays per literal.
+
+    Args:
+        width (int): number of literals the generated function handles
+
+    Returns:
+        function evaluating a clause literal array of exactly that width
+    """
+    block = """
+    lit = lits[{i}]
+    val = assignment[lit if lit > 0 else -lit]
+    if val == UNASSIGNED:
+        undecided = True
+    elif (val == TRUE) == (lit > 0):
+        return True"""
+    source = f"def evaluate_k{width}(lits, assignment):\n    undecided = False"
+    for i in range(width):
+        source += block.format(i=i)
+    source += "\n    return None if undecided else False\n"
+    namespace = {"UNASSIGNED": UNASSIGNED, "TRUE": TRUE}
+    exec(source, namespace)
+    return namespace[f"evaluate_k{width}"]
+
+
+
+# unrolled evaluate variants for the common short clause widths; longer
+# clauses fall back to the generic loop
+EVALUATE_BY_WIDTH = {width: make_specialized_evaluate(width) for width in (1, 2, 3, 4)}
 
 
 
-@dataclass(frozen=True)
 class Clause:
     """
-    Tis class represents a clause, that is a disjunction (OR) of literals.
-    
+    This class represents a clause, that is a disjunction (OR) of literals.
+
+    Literals are stored as signed integers: a positive id stands for the variable
+    itself, a negative id for its negation. Variable ids start at 1 so that the
+    sign is always meaningful.
+
     Args:
-        literals (FrozenSet[Literal]): set of literals per clause
+        lits (array): sorted array of signed literal ids (typecode 'i')
     """
-    literals: FrozenSet[Literal]
+
+    # sentinel for clauses that contain a literal and its negation, assigned
+    # below the class body; callers compare against it by identity and drop it
+    TAUTOLOGY: "Clause"
+
+
+
+    def __init__(self, lits: array) -> None:
+        self.lits = lits
+        # bitset over literals (bit 2*|l| for l, 2*|l|+1 for ¬l): subset and
+        # intersection checks become single big-int operations that CPython
+        # executes word-parallel in C
+        mask = 0
+        for lit in lits:
+            mask |= 1 << (2 * lit if lit > 0 else -2 * lit + 1)
+        self.mask = mask
 
 
 
     @staticmethod
-    def of(lits: Iterable[Literal]) -> "Clause":
+    def of(lits: Iterable[int]) -> "Clause":
         """
-        This function builds a clause from an Iterable-object of literals.
+        This function builds a clause from an Iterable-object of signed literal ids.
 
         Args:
-            lits (Iterable[Literal]): literals of the clause
+            lits (Iterable[int]): signed literal ids of the clause
 
         Returns:
-            clause of literals (of datatype Clause(frozenset(literals)))
+            clause of literals (of datatype Clause(array('i', ...)))
+            OR
+            Clause.TAUTOLOGY if the clause contains a literal and its negation
         """
-        lits_set: Set[Literal] = set(lits)
-        names_to_signs: Dict[str, Set[bool]] = {}
+        lits_set = set(lits)
         for lit in lits_set:
-            names_to_signs.setdefault(lit.name, set()).add(lit.negated)
-        for signs in names_to_signs.values():
-            if len(signs) == 2:
+            if -lit in lits_set:
                 # if clause consist of a literal and it's negation, it is always true.
-                pass
-        return Clause(frozenset(lits_set))
+                return Clause.TAUTOLOGY
+        return Clause(array("i", sorted(lits_set)))
 
 
 
@@ -47,40 +107,40 @@ class Clause:
         Returns:
             boolean that indicates weather the clause is empty or not
         """
-        return len(self.literals) == 0
+        return len(self.lits) == 0
 
 
 
-    def is_unit(self, assignment: Dict[str, bool]) -> bool:
+    def is_unit(self, assignment: bytearray) -> bool:
         """
         This function checks weather the clause is an unit-clause.
 
         Args:
-            assignment (Dict[str, bool]): variable assignment
+            assignment (bytearray): variable assignment indexed by variable id
 
         Returns:
             True if clause is a unit-clause, otherwise False
         """
         undecided = 0
-        for lit in self.literals:
-            val = lit.eval(assignment)
-            if val is True:
-                return False
-            if val is None:
+        for lit in self.lits:
+            val = assignment[lit if lit > 0 else -lit]
+            if val == UNASSIGNED:
                 undecided += 1
                 if undecided > 1:
                     return False
+            elif (val == TRUE) == (lit > 0):
+                return False
         return undecided == 1
 
 
 
-    def evaluate(self, assignment: Dict[str, bool]) -> Optional[bool]:
+    def evaluate(self, assignment: bytearray) -> Optional[bool]:
         """
         This function evaluates the clause under an assignment.
 
         Args:
-            assignment (Dict[str, bool]): variable assignment
-        
+            assignment (bytearray): variable assignment indexed by variable id
+
         Returns:
             True if any literal is True
             OR
@@ -88,47 +148,58 @@ class Clause:
             OR
             None if undecided
         """
+        specialized = EVALUATE_BY_WIDTH.get(len(self.lits))
+        if specialized is not None:
+            return specialized(self.lits, assignment)
         undecided = False
-        for lit in self.literals:
-            val = lit.eval(assignment)
-            if val is True:
-                return True
-            if val is None:
+        for lit in self.lits:
+            val = assignment[lit if lit > 0 else -lit]
+            if val == UNASSIGNED:
                 undecided = True
+            elif (val == TRUE) == (lit > 0):
+                return True
         return None if undecided else False
 
 
 
-    def reduce(self, assignment: Dict[str, bool]) -> Optional["Clause"]:
+    def reduce(self, assignment: bytearray) -> Optional["Clause"]:
         """
-        This function applies an assignment. 
-        
+        This function applies an assignment.
+
         Args:
-            assignment (Dict[str, bool]): variable assignment
+            assignment (bytearray): variable assignment indexed by variable id
 
         Returns:
             None if clause is satisfied (drop clause)
             OR
             new clause with falsified literals removed
         """
-        new_lits: Set[Literal] = set()
-        for lit in self.literals:
-            val = lit.eval(assignment)
-            if val is True:
+        new_lits = array("i")
+        for lit in self.lits:
+            val = assignment[lit if lit > 0 else -lit]
+            if val == UNASSIGNED:
+                new_lits.append(lit)
+            elif (val == TRUE) == (lit > 0):
                 return None
-            if val is None:
-                new_lits.add(lit)
-        return Clause(frozenset(new_lits))
+        return Clause(new_lits)
 
 
 
-    def __str__(self) -> str:
+    def to_str(self, var_names: List[str]) -> str:
         """
         This function returns a string representation of a clause.
 
+        Args:
+            var_names (List[str]): variable names indexed by variable id
+
         Returns:
             f-string that represents the clause
         """
-        if not self.literals:
+        if not self.lits:
             return "⊥"
-        return " ∨ ".join(str(l) for l in sorted(self.literals, key=lambda x: (x.name, x.negated)))
\ No newline at end of file
+        ordered = sorted(self.lits, key=lambda l: (var_names[abs(l)], l < 0))
+        return " ∨ ".join(lit_to_str(l, var_names) for l in ordered)
+
+
+
+Clause.TAUTOLOGY = Clause(array("i"))
@@ -1,64 +1,98 @@
 from dataclasses import dataclass
-from typing import Dict, FrozenSet, Iterable, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from .clauses import Clause
-from .literals import Literal
 
 
 
-@dataclass(frozen=True)
+@dataclass
 class Formula:
     """
     This class represents a CNF formula, that is a conjunction (AND) of clauses.
-    
+
     Args:
-        clauses (FrozenSet[Clause]): clause set
+        clauses (List[Clause]): clause list
+        var_names (List[str]): variable names indexed by variable id (index 0 is unused)
     """
-    clauses: FrozenSet[Clause]
+    clauses: List[Clause]
+    var_names: List[str]
 
 
 
     @staticmethod
-    def of(clauses: Iterable[Clause]) -> "Formula":
+    def of(clauses: Iterable[Clause], var_names: List[str]) -> "Formula":
         """
         This function builds a formula from an Iterable-object of clauses.
+        Tautologies, exact duplicates and subsumed clauses (supersets of another
+        clause, e.g. (A ∨ B ∨ C) when (A ∨ B) is present) are dropped, so every
+        later pass over the formula works on fewer clauses.
 
         Args:
             clauses (Iterable[Clause]): clauses of the formula
+            var_names (List[str]): variable names indexed by variable id
 
         Returns:
-            formula of clauses (of datatype Formula(frozenset(clauses)))
+            formula of clauses (of datatype Formula(clauses, var_names))
         """
-        normalized: Set[Clause] = set()
+        normalized: List[Clause] = []
+        seen: Set[Tuple[int, ...]] = set()
         for cl in clauses:
-            names_to_signs: Dict[str, Set[bool]] = {}
-            for lit in cl.literals:
-                names_to_signs.setdefault(lit.name, set()).add(lit.negated)
-            if any(len(signs) == 2 for signs in names_to_signs.values()):
-                # if clause consist of a literal and it's negation, it is always true.
+            if cl is Clause.TAUTOLOGY:
+                continue
+            key = tuple(cl.lits)
+            if key in seen:
+                continue
+            seen.add(key)
+            normalized.append(cl)
+
+        # subsumption pre-pass: shorter clauses first, so any subsumer of a
+        # clause is already kept when the clause is checked; the subset test
+        # uses the clause literal bitsets (S ⊆ C iff S.mask & ~C.mask == 0)
+        normalized.sort(key=lambda c: len(c.lits))
+        kept: List[Clause] = []
+        kept_masks: List[int] = []
+        occurrences: Dict[int, List[int]] = {}
+        for cl in normalized:
+            not_mask = ~cl.mask
+            subsumed = False
+            checked: Set[int] = set()
+            for lit in cl.lits:
+                for si in occurrences.get(lit, ()):
+                    if si in checked:
+                        continue
+                    checked.add(si)
+                    if kept_masks[si] & not_mask == 0:
+                        subsumed = True
+                        break
+                if subsumed:
+                    break
+            if subsumed:
                 continue
-            normalized.add(cl)
-        return Formula(frozenset(normalized))
+            for lit in cl.lits:
+                occurrences.setdefault(lit, []).append(len(kept))
+            kept.append(cl)
+            kept_masks.append(cl.mask)
+        return Formula(kept, var_names)
 
 
 
     def variables(self) -> Set[str]:
         """
-        This function returns the literal names from the formula.
+        This function returns the variable names occurring in the formula.
 
         Returns:
-            set[str]: literal names of formula
+            set[str]: variable names of formula
         """
-        return {lit.name for clause in self.clauses for lit in clause.literals}
+        return {self.var_names[abs(lit)] for clause in self.clauses for lit in clause.lits}
 
 
 
-    def evaluate(self, assignment: Dict[str, bool]) -> Optional[bool]:
+    def evaluate(self, assignment: bytearray) -> Optional[bool]:
         """
         This function evaluates a formula under an assignment.
 
         Args:
-            assignment (Dict[str, bool]): variable assignment
+            assignment (bytearray): variable assignment indexed by variable id
 
         Returns:
             True if all clauses True
@@ -78,67 +112,26 @@ class Formula:
 
 
 
-    def unit_clauses(self, assignment: Dict[str, bool]) -> Set[Clause]:
-        """
-        This function calculates the unit-clauses of the formula.
-
-        Args:
-            assignment (Dict[str, bool]): variable assignment
-
-        Returns:
-            Set[Clause]: set of  unit-clauses
-        """
-        return {cl for cl in self.clauses if cl.is_unit(assignment)}
-
-
-
-    def pure_literals(self, assignment: Dict[str, bool]) -> Set[Literal]:
-        """
-        This function finds pure literals among currently undecided occurrences.
-
-        Args:
-            assignment (Dict[str, bool]): variable assignment
-
-        Returns:
-            Set[Literal]: pure literals of formula
-        """
-        sign_by_var: Dict[str, Set[bool]] = {}
-        for cl in self.clauses:
-            cl_val = cl.evaluate(assignment)
-            if cl_val is True:
-                continue
-            for lit in cl.literals:
-                if lit.eval(assignment) is None:
-                    sign_by_var.setdefault(lit.name, set()).add(lit.negated)
-        pures: Set[Literal] = set()
-        for var, signs in sign_by_var.items():
-            if len(signs) == 1:
-                only_negated = next(iter(signs))
-                pures.add(Literal(var, only_negated))
-        return pures
-
-
-
-    def reduce(self, assignment: Dict[str, bool]) -> Tuple["Formula", bool]:
+    def reduce(self, assignment: bytearray) -> Tuple["Formula", bool]:
         """
-        This function applies the assignment to all clauses and returns a tuple indicating the 
+        This function applies the assignment to all clauses and returns a tuple indicating the
         (reduced_formula, contradiction_flag). If any clause becomes empty -> contradiction_flag=True.
 
         Args:
-            assignment (Dict[str, bool]): variable assignment
+            assignment (bytearray): variable assignment indexed by variable id
 
         Returns:
             Tuple[Formula, bool]: tuple of reduced formula and contradiction flag
         """
-        new_clauses: Set[Clause] = set()
+        new_clauses: List[Clause] = []
         for cl in self.clauses:
             red = cl.reduce(assignment)
             if red is None:
                 continue
             if red.is_empty():
-                return Formula(frozenset()), True
-            new_clauses.add(red)
-        return Formula(frozenset(new_clauses)), False
+                return Formula([], self.var_names), True
+            new_clauses.append(red)
+        return Formula(new_clauses, self.var_names), False
 
 
 
@@ -151,4 +144,5 @@ class Formula:
         """
         if not self.clauses:
             return "⊤"
-        return " ∧ ".join(f"({cl})" for cl in sorted(self.clauses, key=lambda c: sorted((l.name, l.negated) for l in c.literals)))
\ No newline at end of file
+        ordered = sorted(self.clauses, key=lambda c: sorted((self.var_names[abs(l)], l < 0) for l in c.lits))
+        return " ∧ ".join(f"({cl.to_str(self.var_names)})" for cl in ordered)
@@ -1,32 +1,45 @@
-from typing import Set
+import sys
+from typing import Dict, List, Set
 
 from .clauses import Clause
 from .formula import Formula
-from .literals import Literal
 
 
 
-def parse_clause(line: str) -> Clause:
+def parse_clause(line: str, var_to_id: Dict[str, int], var_names: List[str]) -> Clause:
     """
     This function parses a single line into a Clause.
     Tokens are separated by whitespace. Negations allowed via - prefix.
     Example: "A -B C"  <=> (A ∨ ¬B ∨ C)
 
+    Variable names are interned into contiguous integer ids; var_to_id and
+    var_names are updated in place for variables seen the first time.
+
     Args:
         line (str): read line from stdin
+        var_to_id (Dict[str, int]): mapping of variable names to variable ids
+        var_names (List[str]): variable names indexed by variable id
 
     Returns:
         clause of read input
     """
     tokens = [tok for tok in line.strip().split() if tok]
-    lits: Set[Literal] = set()
+    lits: Set[int] = set()
     for tok in tokens:
         negated = False
         name = tok
         if tok.startswith("-"):
             negated = True
             name = tok[len("-"):]
-        lits.add(Literal(name=name, negated=negated))
+        # interning makes the repeated var_to_id lookups a pointer compare
+        # and dedupes the backing storage of recurring variable names
+        name = sys.intern(name)
+        var_id = var_to_id.get(name)
+        if var_id is None:
+            var_id = len(var_names)
+            var_to_id[name] = var_id
+            var_names.append(name)
+        lits.add(-var_id if negated else var_id)
     return Clause.of(lits)
 
 
@@ -35,15 +48,36 @@ def read_formula_from_stdin() -> Formula:
     """
     This function reads the input from stdin.
 
+    Interactive sessions get a prompt per clause. Piped input is read in one
+    go instead, which avoids a write and a read syscall per line for large
+    formulas.
+
     Returns:
         Formula: CNF-SAT formula read from stdin
     """
+    var_to_id: Dict[str, int] = {}
+    var_names: List[str] = [""]  # index 0 is unused so that literal ids can be signed
+    clauses: List[Clause] = []
+
+    if not sys.stdin.isatty():
+        for line in sys.stdin.read().splitlines():
+            if not line.strip():
+                break
+            clause = parse_clause(line, var_to_id, var_names)
+            if clause is not Clause.TAUTOLOGY:
+                clauses.append(clause)
+        formula = Formula.of(clauses, var_names)
+        if not formula.clauses:
+            print("The fomula is empty and therefore satisfiable (⊤).")
+        else:
+            print("\nFormula:", formula, "\n")
+        return formula
+
     print("Welcome to the CNF-SAT Solver!\nPlease type in your formula.\n\nExamples:")
     print("  A B C       is equivalent to (A ∨ B ∨ C)")
     print("  A -B        is equivalent to (A ∨ ¬B)")
     print("  An empty line ends the process.\n")
 
-    clauses: Set[Clause] = set()
     while True:
         try:
             line = input("> ").strip()
@@ -51,12 +85,13 @@ def read_formula_from_stdin() -> Formula:
             break
         if not line:
             break
-        clause = parse_clause(line)
-        clauses.add(clause)
+        clause = parse_clause(line, var_to_id, var_names)
+        if clause is not Clause.TAUTOLOGY:
+            clauses.append(clause)
 
-    formula = Formula.of(clauses)
+    formula = Formula.of(clauses, var_names)
     if not formula.clauses:
         print("The fomula is empty and therefore satisfiable (⊤).")
     else:
         print("\nFormula:", formula, "\n")
-    return formula
\ No newline at end of file
+    return formula
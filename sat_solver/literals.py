@@ -1,44 +1,65 @@
-from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import List
 
 
 
-@dataclass(frozen=True)
-class Literal:
+# A literal is a plain signed integer: a positive variable id stands for the
+# variable itself, a negative one for its negation. Variable ids start at 1 so
+# that the sign is always meaningful. Compared to a wrapper object this keeps a
+# literal at machine-int size and avoids attribute lookups and string hashing.
+
+
+
+def neg(lit: int) -> int:
     """
-    This class represents a propositional literal.
-    
+    This function negates a literal.
+
     Args:
-        name (str): name of literal
-        negated (bool): boolean that indicates weather the literal is negated or not
+        lit (int): signed literal id
+
+    Returns:
+        int: the negated literal
     """
-    name: str
-    negated: bool = False
+    return -lit
 
 
 
-    def eval(self, assignment: Dict[str, bool]) -> Optional[bool]:
-        """
-        This function evaluates a literal under an assignment.
+def var(lit: int) -> int:
+    """
+    This function returns the variable id of a literal.
 
-        Args:
-            assignment (Dict[str, bool]): variable assignment
-        
-        Returns:
-            Optional[bool]: truth value of literal or None if variable is unassigned
-        """
-        if self.name not in assignment:
-            return None
-        val = assignment[self.name]
-        return (not val) if self.negated else val
+    Args:
+        lit (int): signed literal id
 
+    Returns:
+        int: the (positive) variable id
+    """
+    return -lit if lit < 0 else lit
 
 
-    def __str__(self) -> str:
-        """
-        This function produces a string representation of a Literal.
 
-        Returns:
-            f-string of variable name with optional negation sign (¬)
-        """
-        return f"¬{self.name}" if self.negated else self.name
\ No newline at end of file
+def sign(lit: int) -> bool:
+    """
+    This function returns the polarity of a literal.
+
+    Args:
+        lit (int): signed literal id
+
+    Returns:
+        True if the literal is positive, False if it is negated
+    """
+    return lit > 0
+
+
+
+def lit_to_str(lit: int, var_names: List[str]) -> str:
+    """
+    This function produces a string representation of a literal.
+
+    Args:
+        lit (int): signed literal id
+        var_names (List[str]): variable names indexed by variable id
+
+    Returns:
+        f-string of variable name with optional negation sign (¬)
+    """
+    return f"¬{var_names[-lit]}" if lit < 0 else var_names[lit]